@@ -2,17 +2,53 @@ import os
 import json
 import struct
 from pathlib import Path
-from scipy.spatial.transform import Rotation as R
+from scipy.spatial.transform import Rotation as R, Slerp
 import rerun as rr
 import glob
 import numpy as np
 import cv2
 import argparse  # Added for command-line arguments
 import re # Ensure re is imported
+import queue
+import threading
+import warnings
+import functools
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Path to downloaded data
 DATA_DIR = Path(os.path.dirname(os.path.abspath(__file__))) / "../data"
 
+# Number of decoded video frames buffered ahead of the Rerun logging loop
+VIDEO_PREFETCH_FRAMES = 8
+
+# Decoded video frames buffered per rr.send_columns call (about 100 MB at 1080p)
+VIDEO_LOG_CHUNK_FRAMES = 16
+
+# Resized depth frames buffered per rr.send_columns call (about 45 MB at 1920x1440)
+DEPTH_LOG_CHUNK_FRAMES = 8
+
+# Depth frames read ahead of the Rerun logging loop, and the threads reading them
+DEPTH_PREFETCH_FRAMES = 8
+DEPTH_PREFETCH_WORKERS = 4
+
+# Packed depth stream written by --pack_depth: every frame back to back, plus a (timestamp, offset) index
+DEPTH_PACK_FILENAME = "depth_all.bin"
+DEPTH_INDEX_FILENAME = "depth_index.npy"
+DEPTH_INDEX_DTYPE = np.dtype([("timestamp", np.float64), ("offset", np.int64)])
+
+# Depth filenames are "<timestamp>.d32"
+_D32_TS_RE = re.compile(r'([0-9]+\.[0-9]+)\.d32$')
+
+# Binary camera poses: "times" (N,) float64 and "matrices" (N,4,4); a cache of camera_poses.json, or standalone
+CAMERA_POSES_NPZ_FILENAME = "camera_poses.npz"
+
+# ARKit device frame (+X right, +Y up, +Z out of screen) to Rerun RDF camera frame (+X right, +Y down, +Z into scene):
+# a 180 deg rotation about X, as a matrix (post-multiplies camera pose rotations) and as an xyzw quaternion
+M_ARKIT_DEVICE_TO_RERUN_CAM = np.array([[1, 0, 0], [0, -1, 0], [0, 0, -1]], dtype=np.float32)
+Q_ARKIT_DEVICE_TO_RERUN_CAM_XYZW = np.array([1.0, 0.0, 0.0, 0.0])
+
 def find_scan_folders():
     """Find all Scan-* folders in the local data directory, sorted from newest to oldest."""
     if not DATA_DIR.exists():
@@ -38,7 +74,11 @@ def load_video_timestamps_json(json_path):
     return [entry['wall_clock'] for entry in data]
 
 def extract_video_timestamps_from_video_file(video_path):
-    """Extracts timestamps by reading through a video file, assuming constant FPS."""
+    """Extracts timestamps for a video file, assuming constant FPS.
+
+    Uses the frame count from the container header when available and only falls back to
+    stepping through the frames when the header does not report it.
+    """
     if not Path(video_path).exists():
         print(f"Video file {video_path} not found for timestamp extraction.")
         return []
@@ -68,6 +108,12 @@ def extract_video_timestamps_from_video_file(video_path):
         print(f"Counted {frame_count_check} frames, but FPS is 0. Timestamps will be frame indices.")
         return [float(i) for i in range(frame_count_check)] # Fallback to frame indices
 
+    # MOV/MP4 containers record the frame count in their index, so no frame needs to be decoded
+    header_frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if header_frame_count > 0:
+        cap.release()
+        return (np.arange(header_frame_count) / fps).tolist()
+
     frame_idx = 0
     while True:
         # Only check if a frame can be retrieved, don't store it
@@ -81,63 +127,143 @@ def extract_video_timestamps_from_video_file(video_path):
     cap.release()
     return timestamps
 
-def generate_video_frames(video_path):
-    """Yields RGB frames from video.mov using OpenCV, one by one."""
-    cap = cv2.VideoCapture(str(video_path))
+def open_video_capture(video_path):
+    """Opens video_path with OpenCV, requesting hardware-accelerated decoding where the backend supports it.
+
+    OpenCV falls back to software decoding when no hardware decoder is available.
+    """
+    return cv2.VideoCapture(str(video_path), cv2.CAP_ANY, [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+
+def generate_video_frames(video_source, prefetch=VIDEO_PREFETCH_FRAMES, frame_step=1):
+    """Yields BGR frames from video.mov using OpenCV, one by one (as decoded; Rerun is told the color order).
+
+    `video_source` is either a path or an already opened cv2.VideoCapture, which lets the caller
+    reuse the capture it probed for dimensions. The capture is released when iteration ends.
+    Frames are decoded on a background thread into a bounded queue, so decoding frame N+1
+    overlaps with the caller logging frame N (OpenCV releases the GIL while decoding).
+    Only every `frame_step`-th frame (0, step, 2*step, ...) is yielded; the others are
+    skipped with cap.grab(), which advances the stream without retrieving the decoded image.
+    """
+    cap = video_source if isinstance(video_source, cv2.VideoCapture) else open_video_capture(video_source)
     if not cap.isOpened():
-        print(f"Error: Could not open video file {video_path} for frame generation.")
+        print(f"Error: Could not open video file {video_source} for frame generation.")
         return # Stop iteration (generator will be empty)
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        yield frame_rgb
-    cap.release()
+    frame_queue = queue.Queue(maxsize=prefetch)
+    stop_event = threading.Event()
+
+    def put(item):
+        # Blocking put for back-pressure, waking periodically so the reader exits if the consumer stops early
+        while not stop_event.is_set():
+            try:
+                frame_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def reader():
+        try:
+            frame_idx = 0
+            while not stop_event.is_set():
+                if not cap.grab():
+                    break
+                keep = frame_idx % frame_step == 0
+                frame_idx += 1
+                if not keep:
+                    continue
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                if not put(frame):
+                    return
+        finally:
+            cap.release()
+            put(None) # End-of-stream sentinel
+
+    reader_thread = threading.Thread(target=reader, name="video-decoder", daemon=True)
+    reader_thread.start()
+    try:
+        while True:
+            frame = frame_queue.get()
+            if frame is None:
+                break
+            yield frame
+    finally:
+        stop_event.set()
+        reader_thread.join()
 
 def parse_imu_bin(file_path):
-    """Parse an IMU CSV file into a list of events with wall-clock timestamps."""
-    events = []
+    """Parse an IMU CSV file into a dict of per-field NumPy arrays (one row per event).
+
+    Keys: "timestamp" (N,) wall-clock seconds, "attitude" (N,3) roll/pitch/yaw,
+    "rotationRate" (N,3) x/y/z, "userAcceleration" (N,3) x/y/z and, for 13-column files,
+    "gravity" (N,3) x/y/z. Returns an empty dict if no events could be parsed.
+    """
     try:
-        with open(file_path, "r") as f:
-            header = f.readline()  # skip header if present
-            for line_idx, line in enumerate(f):
-                line = line.strip()
-                if not line:
-                    continue
-                parts = line.split(',')
-                if len(parts) == 13:
-                    try:
-                        t_raw, roll, pitch, yaw, rx, ry, rz, ax, ay, az, gx, gy, gz = map(float, parts)
-                        events.append({
-                            "timestamp": t_raw,
-                            "attitude": {"roll": roll, "pitch": pitch, "yaw": yaw},
-                            "rotationRate": {"x": rx, "y": ry, "z": rz},
-                            "userAcceleration": {"x": ax, "y": ay, "z": az},
-                            "gravity": {"x": gx, "y": gy, "z": gz}
-                        })
-                    except ValueError as ve:
-                        print(f"Error converting line to floats: {line} - {ve}")
-                elif len(parts) == 10:
-                    try:
-                        t_raw, roll, pitch, yaw, rx, ry, rz, ax, ay, az = map(float, parts)
-                        events.append({
-                            "timestamp": t_raw,
-                            "attitude": {"roll": roll, "pitch": pitch, "yaw": yaw},
-                            "rotationRate": {"x": rx, "y": ry, "z": rz},
-                            "userAcceleration": {"x": ax, "y": ay, "z": az}
-                        })
-                    except ValueError as ve:
-                        print(f"Error converting line to floats: {line} - {ve}")
-                else:
-                    print(f"Skipping malformed line (expected 13 parts, got {len(parts)}): {line}")
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore") # np.loadtxt warns on files with a header only
+                rows = np.loadtxt(file_path, delimiter=',', skiprows=1, dtype=np.float64, ndmin=2)
+        except ValueError:
+            # Ragged or non-numeric lines; re-read line by line and drop them
+            rows = parse_imu_rows_tolerant(file_path)
     except Exception as e:
         print(f"Error parsing IMU data from {file_path}: {e}")
+        return {}
+
+    if rows.shape[0] == 0:
+        return {}
+    if rows.shape[1] not in (13, 10):
+        print(f"Error: IMU data in {file_path} has {rows.shape[1]} columns, expected 13 or 10.")
+        return {}
+
+    events = {
+        "timestamp": rows[:, 0],
+        "attitude": rows[:, 1:4],
+        "rotationRate": rows[:, 4:7],
+        "userAcceleration": rows[:, 7:10],
+    }
+    if rows.shape[1] == 13:
+        events["gravity"] = rows[:, 10:13]
     return events
 
+def parse_imu_rows_tolerant(file_path):
+    """Slow-path IMU CSV reader that skips malformed lines. Returns an (N, 13) or (N, 10) float64 array."""
+    rows = []
+    with open(file_path, "r") as f:
+        header = f.readline()  # skip header if present
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            parts = line.split(',')
+            # All rows must share the width of the first valid row to form a single array
+            expected_parts = len(rows[0]) if rows else None
+            if len(parts) not in (13, 10) or (expected_parts is not None and len(parts) != expected_parts):
+                print(f"Skipping malformed line (expected {expected_parts or '13 or 10'} parts, got {len(parts)}): {line}")
+                continue
+            try:
+                rows.append([float(part) for part in parts])
+            except ValueError as ve:
+                print(f"Error converting line to floats: {line} - {ve}")
+    if not rows:
+        return np.empty((0, 13), dtype=np.float64)
+    return np.array(rows, dtype=np.float64)
+
+def find_closest_indices(target_timestamps, sorted_timestamps):
+    """For each target timestamp, returns the index of the closest entry in sorted_timestamps (sorted 1-D).
+
+    Vectorized over target_timestamps with a single np.searchsorted. A target exactly halfway between two
+    entries maps to the later one; targets outside the range map to the first or last entry.
+    """
+    sorted_timestamps = np.asarray(sorted_timestamps, dtype=np.float64)
+    target_timestamps = np.asarray(target_timestamps, dtype=np.float64)
+    idx_after = np.searchsorted(sorted_timestamps, target_timestamps, side="left").clip(0, len(sorted_timestamps) - 1)
+    idx_before = np.maximum(idx_after - 1, 0)
+    pick_before = (target_timestamps - sorted_timestamps[idx_before]) < (sorted_timestamps[idx_after] - target_timestamps)
+    return np.where(pick_before, idx_before, idx_after)
+
 def locate_imu_file(folder_path):
     """Find the IMU file in the given folder"""
     imu_path = folder_path / "imu.bin"
@@ -152,7 +278,11 @@ def locate_imu_file(folder_path):
     return None
 
 def euler_to_quaternion(roll, pitch, yaw):
-    """Convert Euler angles (roll, pitch, yaw) to quaternion (x, y, z, w) for rerun Transform3D"""
+    """Convert Euler angles (roll, pitch, yaw) to quaternion (x, y, z, w) for rerun Transform3D.
+
+    Accepts scalars or broadcastable arrays; returns an array of shape (..., 4).
+    """
+    roll, pitch, yaw = np.asarray(roll), np.asarray(pitch), np.asarray(yaw)
     cy = np.cos(yaw * 0.5)
     sy = np.sin(yaw * 0.5)
     cp = np.cos(pitch * 0.5)
@@ -164,16 +294,31 @@ def euler_to_quaternion(roll, pitch, yaw):
     x = sr * cp * cy - cr * sp * sy
     y = cr * sp * cy + sr * cp * sy
     z = cr * cp * sy - sr * sp * cy
-    return [x, y, z, w]
+    return np.stack(np.broadcast_arrays(x, y, z, w), axis=-1)
 
 # Helper for quaternion multiplication (xyzw format)
 def quaternion_multiply(q1_xyzw, q2_xyzw):
     """Multiplies two quaternions in [x,y,z,w] format. q_total = q1 * q2 (apply q2 then q1)."""
-    # SciPy's Rotation expects scalar-last (xyzw)
-    r1 = R.from_quat(q1_xyzw)
-    r2 = R.from_quat(q2_xyzw)
-    r_total = r1 * r2
-    return r_total.as_quat()
+    return quaternion_multiply_batch(q1_xyzw, q2_xyzw)
+
+def quaternion_multiply_batch(q1_xyzw, q2_xyzw):
+    """Hamilton product of quaternion arrays in [..., x,y,z,w] format; broadcasts like NumPy (e.g. (N,4) * (4,))."""
+    x1, y1, z1, w1 = np.moveaxis(np.asarray(q1_xyzw, dtype=np.float64), -1, 0)
+    x2, y2, z2, w2 = np.moveaxis(np.asarray(q2_xyzw, dtype=np.float64), -1, 0)
+    return np.stack([
+        w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+        w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+        w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+        w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+    ], axis=-1)
+
+def normalize_quaternions(q_xyzw, eps=1e-6):
+    """Normalize quaternions in [..., x,y,z,w] format; ones with norm <= eps (or NaN) become the identity."""
+    q_xyzw = np.asarray(q_xyzw, dtype=np.float64)
+    norm_sq = np.einsum('...i,...i->...', q_xyzw, q_xyzw)[..., None]
+    valid = norm_sq > eps * eps
+    inv_norm = 1.0 / np.sqrt(np.where(valid, norm_sq, 1.0))
+    return np.where(valid, q_xyzw * inv_norm, np.array([0.0, 0.0, 0.0, 1.0]))
 
 def arkit_device_orientation_from_imu(roll, pitch, yaw, sensor_to_device_rotation_xyzw=None):
     """
@@ -183,54 +328,56 @@ def arkit_device_orientation_from_imu(roll, pitch, yaw, sensor_to_device_rotatio
     is not aligned with the ARKit device frame (+X right, +Y up, +Z out of screen).
 
     Args:
-        roll, pitch, yaw: In radians.
+        roll, pitch, yaw: In radians. Scalars, or equal-length (N,) arrays to convert a whole IMU stream in one call.
         sensor_to_device_rotation_xyzw: Optional [x,y,z,w] quaternion for sensor -> device frame.
                                        If None or identity, assumes IMU frame = device frame.
     Returns:
-        [x,y,z,w] numpy array for q_world_from_arkitDevice.
+        [x,y,z,w] numpy array for q_world_from_arkitDevice, shape (4,) or (N,4).
     """
     # Order ZYX for yaw, pitch, roll. ARKit attitude is typically given in this sequence.
     # This creates q_world_from_sensor
-    q_world_from_sensor = R.from_euler('zyx', [yaw, pitch, roll], degrees=False).as_quat() # xyzw
+    ypr = np.stack(np.broadcast_arrays(yaw, pitch, roll), axis=-1)
+    q_world_from_sensor = R.from_euler('zyx', ypr, degrees=False).as_quat() # xyzw
 
     if sensor_to_device_rotation_xyzw is not None and \
        not np.allclose(sensor_to_device_rotation_xyzw, [0.0, 0.0, 0.0, 1.0], atol=1e-7):
         # q_world_from_device = q_world_from_sensor * q_sensor_to_device
-        q_world_from_device = quaternion_multiply(q_world_from_sensor, sensor_to_device_rotation_xyzw)
+        q_world_from_device = quaternion_multiply_batch(q_world_from_sensor, sensor_to_device_rotation_xyzw)
         return q_world_from_device
     else:
         # Assumes IMU sensor frame is already the ARKit device frame
         return q_world_from_sensor
 
 def rotate_vector_by_quaternion(v, q_xyzw):
-    """Rotates vector v by quaternion q (xyzw)."""
-    # Convert v to a pure quaternion
-    v_quat = np.array([v[0], v[1], v[2], 0.0])
-    # Conjugate of q
-    q_conj = np.array([-q_xyzw[0], -q_xyzw[1], -q_xyzw[2], q_xyzw[3]])
-    # Rotated vector: q * v_pure * q_conjugate
-    # Step 1: q * v_pure
-    qv = quaternion_multiply(q_xyzw, v_quat)
-    # Step 2: (q * v_pure) * q_conjugate
-    qv_q_conj = quaternion_multiply(qv, q_conj)
-    return qv_q_conj[:3] # Return the vector part
+    """Rotates vector v by quaternion q (xyzw). Also accepts (N,3) vectors with (N,4) or (4,) quaternions."""
+    # Expanded q * v * q_conjugate: v' = v + w*t + u x t, with t = 2 * (u x v) and q = (u, w)
+    v = np.asarray(v, dtype=np.float64)
+    q_xyzw = np.asarray(q_xyzw, dtype=np.float64)
+    u = q_xyzw[..., :3]
+    w = q_xyzw[..., 3:]
+    t = 2.0 * np.cross(u, v)
+    return v + w * t + np.cross(u, t)
 
 def scan_depth_files(depth_dir):
     """Scans depth directory, extracts timestamps from filenames, returns sorted list of {'timestamp': ts, 'path': filepath}."""
     if not depth_dir.exists():
         return []
     
+    # os.scandir yields names and paths directly, without building a Path object per entry
+    with os.scandir(depth_dir) as it:
+        entries = [(e.name, e.path) for e in it if e.name.endswith('.d32')]
+    entries.sort()
+
     depth_files_info = []
-    # Using Path.glob for cleaner path handling
-    for f_path in sorted(depth_dir.glob('*.d32')):
-        match = re.search(r'([0-9]+\.[0-9]+)\.d32$', f_path.name) # Corrected regex
+    for name, path in entries:
+        match = _D32_TS_RE.search(name)
         if match:
             ts = float(match.group(1))
-            depth_files_info.append({'timestamp': ts, 'path': str(f_path)})
+            depth_files_info.append({'timestamp': ts, 'path': path})
         else:
             # Fallback: use index if timestamp cannot be parsed (less accurate)
             # This case should be rare if filenames are consistent.
-            print(f"Warning: Could not parse timestamp from depth filename: {f_path.name}. This depth map might be ignored or misaligned.")
+            print(f"Warning: Could not parse timestamp from depth filename: {name}. This depth map might be ignored or misaligned.")
             # Optionally, assign a placeholder timestamp or skip
             # For now, we skip files with unparsable timestamps to avoid issues.
             # depth_files_info.append({'timestamp': float(len(depth_files_info)), 'path': str(f_path), 'is_fallback_ts': True})
@@ -240,143 +387,229 @@ def scan_depth_files(depth_dir):
     return depth_files_info
 
 def load_single_depth_frame(filepath, depth_height, depth_width):
-    """Loads a single .d32 depth frame from a given filepath."""
+    """Maps a single .d32 depth frame from a given filepath as a read-only (H, W) float32 array."""
     if not depth_height or not depth_width or depth_height <= 0 or depth_width <= 0:
         print(f"Error: Invalid depth dimensions (h={depth_height}, w={depth_width}) for loading {filepath}.")
         return None
     
     expected_elements = depth_height * depth_width
     try:
-        arr = np.fromfile(filepath, dtype=np.float32)
+        file_elements = os.path.getsize(filepath) // np.dtype(np.float32).itemsize
     except Exception as e:
         print(f"Error reading file {filepath}: {e}")
         return None
         
-    if arr.size == expected_elements:
-        try:
-            arr = arr.reshape((depth_height, depth_width))
-            return arr
-        except ValueError as ve:
-            print(f"Error reshaping depth frame from {filepath} to ({depth_height}, {depth_width}). Array size: {arr.size}. Error: {ve}")
-            return None
-    else:
-        print(f"Warning: Depth file {filepath} has unexpected element count {arr.size}. Expected {expected_elements} ({depth_height}x{depth_width}). Skipping.")
+    if file_elements != expected_elements:
+        print(f"Warning: Depth file {filepath} has unexpected element count {file_elements}. Expected {expected_elements} ({depth_height}x{depth_width}). Skipping.")
         return None
 
-def find_closest_event_by_timestamp(target_timestamp, sorted_events_with_timestamp_key, timestamp_key_name="timestamp"):
-    """Finds the event in sorted_events_with_timestamp_key closest to target_timestamp.
-    Assumes sorted_events_with_timestamp_key is sorted by the timestamp_key_name.
+    try:
+        # Memory-map instead of np.fromfile: no read+copy into a fresh buffer, the page cache backs the array
+        return np.memmap(filepath, dtype=np.float32, mode='r', shape=(depth_height, depth_width))
+    except Exception as e:
+        print(f"Error reading file {filepath}: {e}")
+        return None
+
+def pack_depth_files(session_folder, scanned_depth_info_list, depth_height, depth_width):
+    """Concatenates the session's .d32 frames into one depth_all.bin with a depth_index.npy of element offsets.
+
+    Returns the depth info list for the packed file (see load_packed_depth_index).
     """
-    if not sorted_events_with_timestamp_key:
+    expected_elements = depth_height * depth_width
+    pack_path = session_folder / DEPTH_PACK_FILENAME
+    index_entries = []
+    with open(pack_path, "wb") as pack_file:
+        for depth_info in scanned_depth_info_list:
+            arr = np.fromfile(depth_info['path'], dtype=np.float32)
+            if arr.size != expected_elements:
+                print(f"Warning: Depth file {depth_info['path']} has unexpected element count {arr.size}. Expected {expected_elements}. Not packed.")
+                continue
+            index_entries.append((depth_info['timestamp'], len(index_entries) * expected_elements))
+            arr.tofile(pack_file)
+    # Written last, so an interrupted pack is never picked up by load_packed_depth_index
+    np.save(session_folder / DEPTH_INDEX_FILENAME, np.array(index_entries, dtype=DEPTH_INDEX_DTYPE))
+    print(f"Packed {len(index_entries)} depth frames into {pack_path}")
+    return load_packed_depth_index(session_folder)
+
+def load_packed_depth_index(session_folder):
+    """Returns [{'timestamp': ts, 'path': depth_all.bin, 'offset': elements}, ...] if the session has packed depth, else []."""
+    index_path = session_folder / DEPTH_INDEX_FILENAME
+    pack_path = session_folder / DEPTH_PACK_FILENAME
+    if not index_path.exists() or not pack_path.exists():
+        return []
+    index = np.load(index_path)
+    return [{'timestamp': float(ts), 'path': str(pack_path), 'offset': int(offset)} for ts, offset in index]
+
+@functools.lru_cache(maxsize=1)
+def map_packed_depth_file(pack_path):
+    """Memory-maps a packed depth file once; repeated frame loads slice this mapping."""
+    return np.memmap(pack_path, dtype=np.float32, mode='r')
+
+def load_depth_frame(depth_info, depth_height, depth_width):
+    """Loads the depth frame described by a scan_depth_files / load_packed_depth_index entry."""
+    if 'offset' not in depth_info:
+        return load_single_depth_frame(depth_info['path'], depth_height, depth_width)
+    if not depth_height or not depth_width or depth_height <= 0 or depth_width <= 0:
+        print(f"Error: Invalid depth dimensions (h={depth_height}, w={depth_width}) for loading {depth_info['path']}.")
         return None
-    
-    # Extract just the timestamps for searchsorted
-    try:
-        event_timestamps = np.array([e[timestamp_key_name] for e in sorted_events_with_timestamp_key])
-    except KeyError:
-        print(f"Error: timestamp_key_name \'{timestamp_key_name}\' not found in one or more events.")
+    packed = map_packed_depth_file(depth_info['path'])
+    start = depth_info['offset']
+    end = start + depth_height * depth_width
+    if end > packed.size:
+        print(f"Warning: Packed depth frame at offset {start} in {depth_info['path']} runs past the end of the file ({packed.size} elements). Skipping.")
         return None
-    except TypeError as te: # Handle cases where events might not be subscriptable if list is malformed
-        print(f"Error: Problem accessing timestamps in events list: {te}")
-        # Fallback: try iterating safely
-        valid_timestamps = []
-        for e_idx, e_event in enumerate(sorted_events_with_timestamp_key):
-            if isinstance(e_event, dict) and timestamp_key_name in e_event:
-                valid_timestamps.append(e_event[timestamp_key_name])
-            else: # If an event is bad, we might have to stop or skip
-                print(f"Warning: Malformed event at index {e_idx}, cannot extract timestamp. List might be unsorted or corrupted.")
-                # Depending on strictness, could return None here or try with partial list
-        if not valid_timestamps: return None
-        event_timestamps = np.array(valid_timestamps)
-        # Note: if we had to filter, the indices from searchsorted might not map back correctly
-        # This fallback is basic; ideally, the input list is clean.
-
-    idx = np.searchsorted(event_timestamps, target_timestamp, side="left")
-    
-    # Handle edge cases for idx
-    if idx == 0:
-        return sorted_events_with_timestamp_key[0]
-    if idx == len(event_timestamps): # Corrected: use length of event_timestamps array
-        return sorted_events_with_timestamp_key[len(sorted_events_with_timestamp_key)-1] # Return last element of original list
-    
-    # Compare with neighbors
-    ts_before = event_timestamps[idx-1]
-    ts_after = event_timestamps[idx] # This index must be valid for event_timestamps
-    
-    # Ensure idx-1 and idx are valid for the original sorted_events_with_timestamp_key list
-    original_list_idx_before = idx -1
-    original_list_idx_after = idx
-
-    # This logic assumes that the event_timestamps array corresponds 1:1 with sorted_events_with_timestamp_key
-    # which is true if no errors occurred during timestamp extraction.
-    if (target_timestamp - ts_before) < (ts_after - target_timestamp):
-        return sorted_events_with_timestamp_key[original_list_idx_before]
-    else:
-        return sorted_events_with_timestamp_key[original_list_idx_after]
+    return packed[start:end].reshape(depth_height, depth_width)
+
+def read_depth_frame(depth_info, depth_height, depth_width):
+    """Like load_depth_frame, but copies the mapped frame into memory so the disk read happens here."""
+    depth_frame = load_depth_frame(depth_info, depth_height, depth_width)
+    return np.array(depth_frame) if depth_frame is not None else None
+
+def prefetch_depth_frames(depth_infos, depth_height, depth_width, prefetch=DEPTH_PREFETCH_FRAMES, workers=DEPTH_PREFETCH_WORKERS):
+    """Yields read_depth_frame() results for depth_infos in order (None for frames that fail to load).
+
+    Up to `prefetch` frames are read ahead on a thread pool, so disk reads overlap with the caller
+    logging the current frame.
+    """
+    depth_infos = iter(depth_infos)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for depth_info in depth_infos:
+            pending.append(executor.submit(read_depth_frame, depth_info, depth_height, depth_width))
+            if len(pending) >= prefetch:
+                break
+        while pending:
+            depth_frame = pending.popleft().result()
+            depth_info = next(depth_infos, None)
+            if depth_info is not None:
+                pending.append(executor.submit(read_depth_frame, depth_info, depth_height, depth_width))
+            yield depth_frame
+
+def camera_poses_to_arrays(camera_poses_list):
+    """Converts a list of {"timestamp", "matrix"} dicts to (N,) timestamps and (N,4,4) matrices.
+
+    Entries without a matrix are skipped. Returns None if no pose has a matrix.
+    """
+    poses_with_matrix = [p for p in camera_poses_list if "matrix" in p]
+    if not poses_with_matrix:
+        return None
+    pose_timestamps = np.fromiter((p["timestamp"] for p in poses_with_matrix), dtype=np.float64, count=len(poses_with_matrix))
+    pose_matrices = np.asarray([p["matrix"] for p in poses_with_matrix], dtype=np.float64)
+    return pose_timestamps, pose_matrices
+
+def load_camera_poses_npz(npz_path):
+    """Loads (timestamps, matrices) from a camera_poses.npz, or None if it holds no poses."""
+    with np.load(npz_path) as data:
+        if data["times"].size == 0:
+            return None # Same as camera_poses_to_arrays: no poses means no pose track
+        return data["times"].astype(np.float64), data["matrices"].astype(np.float64)
 
 def parse_camera_poses(session_folder):
-    """Parse camera poses (4x4 matrices) from meta.json or a dedicated file if available."""
-    poses = None
+    """Parse camera poses (4x4 matrices) from camera_poses.json, camera_poses.npz or meta.json, in that order.
+
+    The first replay of a session caches camera_poses.json as camera_poses.npz; later replays load the
+    .npz instead of parsing the JSON, as long as it is at least as new as the JSON.
+    Returns (timestamps, matrices) as (N,) and (N,4,4) float64 arrays, or None if no poses are available.
+    """
+    npz_path = session_folder / CAMERA_POSES_NPZ_FILENAME
     poses_path = session_folder / "camera_poses.json"
     if poses_path.exists():
+        if npz_path.exists() and npz_path.stat().st_mtime >= poses_path.stat().st_mtime:
+            return load_camera_poses_npz(npz_path)
         with open(poses_path, "r") as f:
             poses = json.load(f)
         # Expecting a list of dicts: {"timestamp": float, "matrix": [[...], ...]}
-        return poses
+        camera_poses = camera_poses_to_arrays(poses)
+        if camera_poses is not None:
+            try:
+                np.savez(npz_path, times=camera_poses[0], matrices=camera_poses[1])
+                print(f"Cached {len(camera_poses[0])} camera poses from {poses_path.name} to {npz_path}")
+            except OSError as e:
+                print(f"Warning: Could not write {npz_path}: {e}")
+        return camera_poses
+    if npz_path.exists():
+        return load_camera_poses_npz(npz_path)
     # Optionally, try to load from meta.json if present
     meta_path = session_folder / "meta.json"
     if meta_path.exists():
         with open(meta_path, "r") as f:
             meta = json.load(f)
         if "camera_poses" in meta:
-            return meta["camera_poses"]
+            return camera_poses_to_arrays(meta["camera_poses"])
     return None
 
 def extract_translation_from_matrix(matrix):
     """Extract translation (x, y, z) from a 4x4 transform matrix."""
     return [matrix[0][3], matrix[1][3], matrix[2][3]]
 
-def find_closest_pose(timestamp, poses):
-    """Find the camera pose closest to the given timestamp."""
-    if not poses:
-        return None
-    times = [p["timestamp"] for p in poses]
-    idx = np.searchsorted(times, timestamp, side="left")
-    if idx == 0:
-        return poses[0]
-    if idx == len(times):
-        return poses[-1]
-    before = times[idx-1]
-    after = times[idx]
-    if (timestamp - before) < (after - timestamp):
-        return poses[idx-1]
-    else:
-        return poses[idx]
+def interpolate_camera_poses(pose_timestamps, pose_matrices, query_timestamps):
+    """Interpolates 4x4 camera poses at query_timestamps: SLERP for rotation, linear for translation.
+
+    Query times outside the recorded range are clamped to the first/last pose.
+    Returns an (N,4,4) float64 array.
+    """
+    # Slerp needs strictly increasing key times; np.unique also sorts them
+    pose_timestamps, unique_idx = np.unique(pose_timestamps, return_index=True)
+    pose_matrices = pose_matrices[unique_idx]
+
+    query_timestamps = np.clip(np.asarray(query_timestamps, dtype=np.float64), pose_timestamps[0], pose_timestamps[-1])
+    interpolated = np.tile(np.eye(4), (len(query_timestamps), 1, 1))
+    if len(pose_timestamps) == 1:
+        interpolated[:] = pose_matrices[0]
+        return interpolated
+
+    slerp = Slerp(pose_timestamps, R.from_matrix(pose_matrices[:, :3, :3]))
+    interpolated[:, :3, :3] = slerp(query_timestamps).as_matrix()
+    for axis in range(3):
+        interpolated[:, axis, 3] = np.interp(query_timestamps, pose_timestamps, pose_matrices[:, axis, 3])
+    return interpolated
 
 def save_camera_poses_from_imu(session_folder, session_imu_events):
-    """Save a camera_poses.json file with identity rotation and zero translation for each IMU event (placeholder)."""
-    poses = []
-    for event in session_imu_events:
-        # Identity 4x4 matrix (no translation, no rotation)
-        matrix = [
-            [1, 0, 0, 0],
-            [0, 1, 0, 0],
-            [0, 0, 1, 0],
-            [0, 0, 0, 1],
-        ]
-        poses.append({
-            "timestamp": event["timestamp"],
-            "matrix": matrix
-        })
-    out_path = session_folder / "camera_poses.json"
-    with open(out_path, "w") as f:
-        json.dump(poses, f, indent=2)
-    print(f"Wrote placeholder camera_poses.json with {len(poses)} poses to {out_path}")
+    """Save a camera_poses.npz file with identity rotation and zero translation for each IMU event (placeholder)."""
+    times = np.asarray(session_imu_events.get("timestamp", []), dtype=np.float64)
+    # Identity 4x4 matrix (no translation, no rotation) per event
+    matrices = np.tile(np.eye(4, dtype=np.float32), (len(times), 1, 1))
+    out_path = session_folder / CAMERA_POSES_NPZ_FILENAME
+    np.savez_compressed(out_path, times=times, matrices=matrices)
+    print(f"Wrote placeholder {CAMERA_POSES_NPZ_FILENAME} with {len(times)} poses to {out_path}")
+
+def log_imu_scalar_columns(imu_data_path, time_columns, attitude, rotation_rate, user_acceleration):
+    """Logs the nine IMU scalar channels under imu_data_path as whole columns, one rr.send_columns call per channel.
+
+    attitude (roll/pitch/yaw), rotation_rate and user_acceleration are (N,3) arrays aligned with time_columns.
+    """
+    imu_data_to_log = {
+        "angular_velocity_x": rotation_rate[:, 0], "angular_velocity_y": rotation_rate[:, 1], "angular_velocity_z": rotation_rate[:, 2],
+        "acceleration_x": user_acceleration[:, 0], "acceleration_y": user_acceleration[:, 1], "acceleration_z": user_acceleration[:, 2],
+        "attitude_roll": attitude[:, 0], "attitude_pitch": attitude[:, 1], "attitude_yaw": attitude[:, 2]
+    }
+    for key, values in imu_data_to_log.items():
+        rr.send_columns(
+            f"{imu_data_path}/{key}",
+            indexes=time_columns,
+            columns=rr.Scalars.columns(scalars=values.astype(np.float64)),
+        )
+
+def send_image_frame_columns(entity_path, frame_timeline, timestamps, frame_indices, frame_buffers, archetype=rr.Image):
+    """Logs a chunk of image frames, one flattened row per frame, with a single rr.send_columns call.
+
+    `archetype` is rr.Image or rr.DepthImage; its format must already be logged statically on entity_path.
+    Rows are sent as raw bytes, so floating-point depth rows keep their bit patterns.
+    """
+    rr.send_columns(
+        entity_path,
+        indexes=[
+            rr.TimeColumn("timestamp", timestamp=timestamps),
+            rr.TimeColumn(frame_timeline, sequence=frame_indices),
+        ],
+        columns=archetype.columns(buffer=frame_buffers.view(np.uint8)),
+    )
 
 def visualize_single_session_in_rerun(session_id, session_imu_events, session_metadata, 
                                       video_timestamps_list, # New: list of video timestamps
                                       scanned_depth_info_list, # New: list of {'ts': path}
-                                      camera_poses_list): # New: pass parsed camera poses
+                                      camera_poses, # (timestamps, matrices) from parse_camera_poses, or None
+                                      max_video_fps=None): # Cap on the logged RGB framerate; None logs every frame
 
     print(f"\\\\n--- Visualizing session: {session_id} ---")
     # rr.init specific to this session to keep data separate if multiple are processed (though current main() does one)
@@ -402,45 +635,42 @@ def visualize_single_session_in_rerun(session_id, session_imu_events, session_me
     # Add other named extrinsics here if they become necessary.
     print(f"[IMU_SETUP] Using IMU sensor to ARKit device extrinsic: {imu_sensor_to_arkit_device_extrinsic_name}")
 
-    # --- Define ARKit Device to Rerun Camera coordinate system rotation ---
-    # ARKit device frame: +X right, +Y up, +Z out of screen (towards user/backwards from scene)
-    # Rerun RDF camera frame: +X right, +Y down, +Z into scene (forwards)
-    # This matrix rotates ARKit device coordinates to Rerun camera coordinates (180 deg around X).
-    M_arkitDevice_to_rerunCam = np.array([[1,0,0], [0,-1,0], [0,0,-1]], dtype=np.float32)
-    q_arkitDevice_to_rerunCam_xyzw = R.from_matrix(M_arkitDevice_to_rerunCam).as_quat() # xyzw
-    print(f"[COORD_SYS] ARKit Device to Rerun Camera RDF transform (q_arkitDevice_to_rerunCam_xyzw): {q_arkitDevice_to_rerunCam_xyzw}")
-
-    # Create a 4x4 transformation matrix for post-multiplication
-    T_arkitDevice_from_rerunCamera_4x4 = np.eye(4, dtype=np.float32)
-    T_arkitDevice_from_rerunCamera_4x4[0:3, 0:3] = M_arkitDevice_to_rerunCam
+    # --- ARKit Device to Rerun Camera coordinate system rotation (module constants, 180 deg around X) ---
+    print(f"[COORD_SYS] ARKit Device to Rerun Camera RDF transform (Q_ARKIT_DEVICE_TO_RERUN_CAM_XYZW): {Q_ARKIT_DEVICE_TO_RERUN_CAM_XYZW}")
 
     # rr.spawn() # Spawns the Rerun viewer application - moved to main or called after all logging for a session.
 
     if session_imu_events:
-        session_imu_events.sort(key=lambda e: e["timestamp"]) # Ensure IMU events are sorted
-        print(f"Found {len(session_imu_events)} IMU events for session {session_id}")
+        # Ensure IMU events are sorted; reorder every field array with the same permutation
+        imu_order = np.argsort(session_imu_events["timestamp"], kind="stable")
+        session_imu_events = {field: values[imu_order] for field, values in session_imu_events.items()}
+        imu_timestamps = session_imu_events["timestamp"]
+        print(f"Found {len(imu_timestamps)} IMU events for session {session_id}")
         # ---- START DIAGNOSTIC PRINTS ----
-        imu_timestamps_for_diag = [e["timestamp"] for e in session_imu_events]
-        if imu_timestamps_for_diag:
-            print(f"DIAG: IMU timestamps range: min={min(imu_timestamps_for_diag):.3f}s, max={max(imu_timestamps_for_diag):.3f}s")
+        print(f"DIAG: IMU timestamps range: min={imu_timestamps[0]:.3f}s, max={imu_timestamps[-1]:.3f}s")
         # ---- END DIAGNOSTIC PRINTS ----
 
     # Determine width and height for Pinhole camera model
     width, height = 640, 480 # Default resolution
     
     video_mov_path = DATA_DIR / session_id / "video.mov"
+    video_cap = None # Kept open for frame decoding when video is the primary source
     if video_mov_path.exists():
-        temp_cap = cv2.VideoCapture(str(video_mov_path))
-        if temp_cap.isOpened():
-            vid_w = int(temp_cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            vid_h = int(temp_cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        video_cap = open_video_capture(video_mov_path)
+        if video_cap.isOpened():
+            vid_w = int(video_cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            vid_h = int(video_cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             if vid_w > 0 and vid_h > 0:
                 width, height = vid_w, vid_h
                 print(f"Determined Pinhole dimensions from video.mov: {width}x{height}")
             else:
                 print(f"Warning: video.mov found but dimensions are invalid ({vid_w}x{vid_h}). Using defaults or metadata-derived: {width}x{height}")
-            temp_cap.release()
+            if not video_timestamps_list:
+                # Video won't be replayed without timestamps, so only the dimensions were needed
+                video_cap.release()
+                video_cap = None
         else:
+            video_cap = None
             print(f"Warning: Could not open video.mov at {video_mov_path} to get dimensions. Using defaults or metadata-derived: {width}x{height}")
     
     # If video dimensions weren't found/valid or video doesn't exist, try metadata for depth
@@ -465,6 +695,9 @@ def visualize_single_session_in_rerun(session_id, session_imu_events, session_me
     # --- Log Pinhole Camera Model once per session ---
     # This is logged to the camera's entity path and will apply to images logged there.
     base_camera_path = f"{session_id}/device/camera"
+    imu_data_path = f"{session_id}/device/imu"
+    frame_timeline = f"{session_id}_frame_idx" # Sequence timeline for synchronized frames
+    imu_event_timeline = f"{session_id}_imu_event_idx" # Sequence timeline for IMU-only sessions
     
     # Attempt to get resolution from video if available, otherwise use default or depth
     # The width and height are now determined by the robust logic block above.
@@ -510,6 +743,7 @@ def visualize_single_session_in_rerun(session_id, session_imu_events, session_me
     # --- Depth framerate control settings ---
     target_depth_fps = 10.0  # Target depth logging framerate
     depth_frame_skip_interval = 1  # Default: log every frame
+    rgb_frame_skip_interval = 1  # Default: decode and log every video frame
     
     # Determine the primary data source based on what's available
     if video_timestamps_list:
@@ -523,10 +757,13 @@ def visualize_single_session_in_rerun(session_id, session_imu_events, session_me
             estimated_video_fps = (len(video_timestamps_list) - 1) / video_duration if video_duration > 0 else 30.0
             depth_frame_skip_interval = max(1, int(estimated_video_fps / target_depth_fps))
             print(f"Estimated video FPS: {estimated_video_fps:.1f}, depth will be logged every {depth_frame_skip_interval} frames ({target_depth_fps}fps)")
-        # Create video frame generator
-        video_mov_path = DATA_DIR / session_id / "video.mov"
-        if video_mov_path.exists():
-            video_frame_generator = generate_video_frames(video_mov_path)
+            if max_video_fps:
+                # Round the step up so the logged rate (video fps / step) never exceeds the cap
+                rgb_frame_skip_interval = max(1, math.ceil(estimated_video_fps / max_video_fps))
+                print(f"RGB will be logged every {rgb_frame_skip_interval} frames (max {max_video_fps}fps)")
+        # Create video frame generator, reusing the capture opened for the dimension probe
+        if video_cap is not None:
+            video_frame_generator = generate_video_frames(video_cap, frame_step=rgb_frame_skip_interval)
         print(f"Using video as primary source: {num_frames_to_log} frames")
     elif scanned_depth_info_list:
         source_type = "depth"
@@ -542,185 +779,235 @@ def visualize_single_session_in_rerun(session_id, session_imu_events, session_me
         print(f"Using depth as primary source: {num_frames_to_log} frames")
     elif session_imu_events:
         source_type = "imu_only_direct"
-        primary_timestamps = [e['timestamp'] for e in session_imu_events]
-        num_frames_to_log = len(session_imu_events)
+        primary_timestamps = session_imu_events["timestamp"]
+        num_frames_to_log = len(primary_timestamps)
         # For IMU-only mode, depth framerate control is not applicable
         print(f"Using IMU-only mode: {num_frames_to_log} events")
 
     # Handle IMU-only logging path separately for clarity
     if source_type == "imu_only_direct":
-        for imu_idx, event in enumerate(session_imu_events): # Assumes session_imu_events is sorted by timestamp
-            rr.set_time(timeline="timestamp", timestamp=event["timestamp"])
-            rr.set_time(timeline=f"{session_id}_imu_event_idx", sequence=imu_idx)
-            
-            attitude = event.get("attitude", {}) # Use .get for safety
-            rotation = event.get("rotationRate", {})
-            accel = event.get("userAcceleration", {})
-
-            q_world_from_arkitDevice_xyzw = arkit_device_orientation_from_imu(
-                attitude.get("roll", 0.0), attitude.get("pitch", 0.0), attitude.get("yaw", 0.0),
-                sensor_to_device_rotation_xyzw=q_imuSensor_to_arkitDevice_xyzw
-            )
-            q_world_from_camera_final_xyzw = quaternion_multiply(q_world_from_arkitDevice_xyzw, q_arkitDevice_to_rerunCam_xyzw)
-            
-            norm_q_world_camera_final = np.linalg.norm(q_world_from_camera_final_xyzw)
-            if norm_q_world_camera_final > 1e-6:
-                q_world_from_camera_final_xyzw_normalized = q_world_from_camera_final_xyzw / norm_q_world_camera_final
-            else:
-                q_world_from_camera_final_xyzw_normalized = np.array([0.0, 0.0, 0.0, 1.0])
-
-            if np.isfinite(q_world_from_camera_final_xyzw_normalized).all():
-                rr.log(
-                    base_camera_path, # Log transform to the camera entity
-                    rr.Transform3D(
-                        rotation=rr.Quaternion(xyzw=q_world_from_camera_final_xyzw_normalized),
-                        translation=[0.0, 0.0, 0.0] # No translation info from IMU alone for camera pose
-                    )
-                )
-            
-            # Log IMU scalar data (cleaned as in original script)
-            imu_data_path = f"{session_id}/device/imu"
-            cleaned_values = [0.0] * 9
-            # (Copy the cleaning logic for rotation_x/y/z, accel_x/y/z, attitude_roll/pitch/yaw from original here)
-            # For brevity, assuming values are directly usable or cleaned before this point in a real scenario.
-            # This part needs the full cleaning logic from the original script.
-            # Simplified for this example:
-            imu_data_to_log = {
-                "angular_velocity_x": float(rotation.get("x",0.0)), "angular_velocity_y": float(rotation.get("y",0.0)), "angular_velocity_z": float(rotation.get("z",0.0)),
-                "acceleration_x": float(accel.get("x",0.0)), "acceleration_y": float(accel.get("y",0.0)), "acceleration_z": float(accel.get("z",0.0)),
-                "attitude_roll": float(attitude.get("roll",0.0)), "attitude_pitch": float(attitude.get("pitch",0.0)), "attitude_yaw": float(attitude.get("yaw",0.0))
-            }
-            for key, value in imu_data_to_log.items():
-                 rr.log(f"{imu_data_path}/{key}", rr.Scalar(value))
-
-        print(f"Logged {len(session_imu_events)} IMU events for {session_id}.")
+        # Compute every camera orientation up front: one batched Euler conversion and Hamilton product
+        # instead of several SciPy Rotation constructions per event.
+        imu_rpy = session_imu_events["attitude"]
+        q_world_from_arkitDevice_all = arkit_device_orientation_from_imu(
+            imu_rpy[:, 0], imu_rpy[:, 1], imu_rpy[:, 2],
+            sensor_to_device_rotation_xyzw=q_imuSensor_to_arkitDevice_xyzw
+        )
+        q_world_from_camera_all = quaternion_multiply_batch(q_world_from_arkitDevice_all, Q_ARKIT_DEVICE_TO_RERUN_CAM_XYZW)
+        q_world_from_camera_all = normalize_quaternions(q_world_from_camera_all)
+        q_world_from_camera_finite = np.isfinite(q_world_from_camera_all).all(axis=1)
+
+        # Log all camera orientations as one column; events whose quaternion is not finite are left out
+        finite_idx = np.flatnonzero(q_world_from_camera_finite)
+        rr.send_columns(
+            base_camera_path, # Log transform to the camera entity
+            indexes=[
+                rr.TimeColumn("timestamp", timestamp=primary_timestamps[finite_idx]),
+                rr.TimeColumn(imu_event_timeline, sequence=finite_idx),
+            ],
+            columns=rr.Transform3D.columns(
+                translation=np.zeros((len(finite_idx), 3), dtype=np.float32), # No translation info from IMU alone for camera pose
+                quaternion=q_world_from_camera_all[finite_idx].astype(np.float32),
+            ),
+        )
+
+        # Log IMU scalar data as whole columns: one send_columns call per channel instead of one rr.log per event
+        log_imu_scalar_columns(
+            imu_data_path,
+            [
+                rr.TimeColumn("timestamp", timestamp=primary_timestamps),
+                rr.TimeColumn(imu_event_timeline, sequence=np.arange(num_frames_to_log)),
+            ],
+            imu_rpy, session_imu_events["rotationRate"], session_imu_events["userAcceleration"]
+        )
+
+        print(f"Logged {num_frames_to_log} IMU events for {session_id}.")
         return # Finished with this session if it was IMU-only
 
     # --- Synchronize and Log Camera Stream (IMU, Video, Depth) based on primary_timestamps ---
     print(f"Starting synchronized logging for {session_id} with {num_frames_to_log} frames based on {source_type} timestamps...")
+    primary_timestamps = np.asarray(primary_timestamps, dtype=np.float64)
 
     depth_orientation_checked = False
     depth_needs_rot90 = False # Add other flags (flipud, fliplr) if that logic is restored
 
-    for i in range(num_frames_to_log):
-        current_time_sec = primary_timestamps[i]
-        rr.set_time(timeline="timestamp", timestamp=current_time_sec)
-        rr.set_time(timeline=f"{session_id}_frame_idx", sequence=i)
-        
-        closest_imu_event = find_closest_event_by_timestamp(current_time_sec, session_imu_events, "timestamp")
-        closest_pose_info = find_closest_event_by_timestamp(current_time_sec, camera_poses_list, "timestamp")
-
-        translation_from_pose = None
-        pose_matrix_for_transform = None
-
-        if closest_pose_info and "matrix" in closest_pose_info:
-            translation_from_pose = extract_translation_from_matrix(closest_pose_info["matrix"])
-            current_pose_matrix_np = np.array(closest_pose_info["matrix"], dtype=np.float32)
-            identity_4x4 = np.eye(4, dtype=np.float32)
-            if not np.allclose(current_pose_matrix_np, identity_4x4, atol=1e-8):
-                pose_matrix_for_transform = current_pose_matrix_np
-        
-        # ... (Camera Transform Logic: copy from original, using pose_matrix_for_transform and closest_imu_event) ...
-        # This part is complex and involves deciding whether to use pose_matrix_for_transform or IMU for orientation,
-        # then applying the M_arkitDevice_to_rerunCam transform.
-        # For brevity, this detailed logic block is represented by this comment.
-        # Ensure to log to base_camera_path with rr.Transform3D.
-        # Simplified placeholder for camera transform logging:
-        final_translation_for_log = translation_from_pose if translation_from_pose is not None else [0.0, 0.0, 0.0]
-        final_rotation_for_log_xyzw = np.array([0.0,0.0,0.0,1.0]) # Default identity
-
-        if pose_matrix_for_transform is not None:
-            M_world_from_arkitDevice_4x4 = pose_matrix_for_transform
-            M_world_from_rerunCamera_4x4 = M_world_from_arkitDevice_4x4 @ T_arkitDevice_from_rerunCamera_4x4
-            R_world_from_rerunCamera = M_world_from_rerunCamera_4x4[0:3, 0:3]
-            final_translation_for_log = M_world_from_rerunCamera_4x4[0:3, 3].tolist()
-            final_rotation_for_log_xyzw = R.from_matrix(R_world_from_rerunCamera).as_quat()
-        elif closest_imu_event:
-            attitude = closest_imu_event.get("attitude", {})
-            q_world_from_arkitDevice_xyzw = arkit_device_orientation_from_imu(
-                attitude.get("roll", 0.0), attitude.get("pitch", 0.0), attitude.get("yaw", 0.0),
-                sensor_to_device_rotation_xyzw=q_imuSensor_to_arkitDevice_xyzw)
-            final_rotation_for_log_xyzw = quaternion_multiply(q_world_from_arkitDevice_xyzw, q_arkitDevice_to_rerunCam_xyzw)
-        
-        norm_final_rot = np.linalg.norm(final_rotation_for_log_xyzw)
-        if norm_final_rot > 1e-6: final_rotation_for_log_xyzw /= norm_final_rot
-        else: final_rotation_for_log_xyzw = np.array([0.0,0.0,0.0,1.0])
-
-        if np.isfinite(final_rotation_for_log_xyzw).all() and np.isfinite(final_translation_for_log).all():
-             rr.log(base_camera_path, rr.Transform3D(translation=final_translation_for_log, rotation=rr.Quaternion(xyzw=final_rotation_for_log_xyzw)))
-
-
-        # Log IMU scalar data (if closest_imu_event exists)
-        if closest_imu_event:
-            # ... (Copy the full IMU scalar cleaning and logging logic from original script here) ...
-            # Simplified:
-            attitude = closest_imu_event.get("attitude", {})
-            rotation = closest_imu_event.get("rotationRate", {})
-            accel = closest_imu_event.get("userAcceleration", {})
-            imu_data_path = f"{session_id}/device/imu"
-            imu_scalars_to_log = {
-                "angular_velocity_x": float(rotation.get("x",0.0)), "angular_velocity_y": float(rotation.get("y",0.0)), # ... and so on
-                "acceleration_x": float(accel.get("x",0.0)), # ...
-                "attitude_roll": float(attitude.get("roll",0.0)), # ...
-            }
-            # This needs the full set of 9 scalars and the cleaning logic.
-            # For now, just an example:
-            if "angular_velocity_x" in imu_scalars_to_log: # Check if key exists
-                 rr.log(f"{imu_data_path}/angular_velocity_x", rr.Scalar(imu_scalars_to_log["angular_velocity_x"]))
-            # Repeat for all 9 cleaned scalars individually.
-
-
-        # Log Video Frame
-        if source_type == "video" and video_frame_generator:
+    # Match every frame to its closest IMU event and depth file up front:
+    # one searchsorted per stream instead of rebuilding timestamp arrays on every frame.
+    # Each stream is assumed sorted by timestamp (IMU is sorted above, depth by scan_depth_files).
+    imu_idx_per_frame = find_closest_indices(primary_timestamps, imu_timestamps) if session_imu_events else None
+    # Camera poses are interpolated (SLERP) at each frame time rather than snapped to the nearest sample
+    pose_matrix_per_frame = interpolate_camera_poses(*camera_poses, primary_timestamps) if camera_poses is not None else None
+    depth_idx_per_frame = None
+    if scanned_depth_info_list:
+        depth_timestamps = np.fromiter((d["timestamp"] for d in scanned_depth_info_list), dtype=np.float64, count=len(scanned_depth_info_list))
+        depth_idx_per_frame = find_closest_indices(primary_timestamps, depth_timestamps)
+
+    # Camera orientation from the matched IMU attitude for every frame, in one batched conversion;
+    # used for frames without a (non-identity) camera pose
+    q_imu_camera_per_frame = None
+    if imu_idx_per_frame is not None:
+        matched_rpy = session_imu_events["attitude"][imu_idx_per_frame]
+        q_world_from_arkitDevice_per_frame = arkit_device_orientation_from_imu(
+            matched_rpy[:, 0], matched_rpy[:, 1], matched_rpy[:, 2],
+            sensor_to_device_rotation_xyzw=q_imuSensor_to_arkitDevice_xyzw)
+        q_imu_camera_per_frame = normalize_quaternions(
+            quaternion_multiply_batch(q_world_from_arkitDevice_per_frame, Q_ARKIT_DEVICE_TO_RERUN_CAM_XYZW))
+
+    # Rerun camera pose for every frame from the interpolated device poses: one stacked matmul and one
+    # batched matrix-to-quaternion conversion instead of a SciPy Rotation per frame.
+    # Only the rotation blocks are multiplied (the camera rotation has no translation), so a non-finite
+    # pose translation cannot leak into the rotation and break R.from_matrix; the finite mask drops that frame.
+    q_pose_camera_per_frame = None
+    t_pose_camera_per_frame = None
+    if pose_matrix_per_frame is not None:
+        R_world_from_rerunCamera_per_frame = pose_matrix_per_frame[:, 0:3, 0:3].astype(np.float32) @ M_ARKIT_DEVICE_TO_RERUN_CAM
+        q_pose_camera_per_frame = normalize_quaternions(R.from_matrix(R_world_from_rerunCamera_per_frame).as_quat())
+        t_pose_camera_per_frame = pose_matrix_per_frame[:, 0:3, 3]
+
+    # Camera transform for every frame: the interpolated pose where it is not identity, otherwise the
+    # IMU orientation (or identity) with the pose translation. Sent as one column instead of per frame.
+    q_camera_per_frame = np.tile(np.array([0.0, 0.0, 0.0, 1.0]), (num_frames_to_log, 1)) # Default identity
+    t_camera_per_frame = np.zeros((num_frames_to_log, 3))
+    if q_imu_camera_per_frame is not None:
+        q_camera_per_frame[:] = q_imu_camera_per_frame
+    if pose_matrix_per_frame is not None:
+        t_camera_per_frame[:] = pose_matrix_per_frame[:, 0:3, 3]
+        # Same tolerance as np.allclose(pose, I, atol=1e-8), evaluated for all frames at once
+        pose_is_set = ~np.isclose(pose_matrix_per_frame.astype(np.float32), np.eye(4, dtype=np.float32), atol=1e-8).all(axis=(1, 2))
+        q_camera_per_frame[pose_is_set] = q_pose_camera_per_frame[pose_is_set]
+        t_camera_per_frame[pose_is_set] = t_pose_camera_per_frame[pose_is_set]
+    camera_finite_idx = np.flatnonzero(np.isfinite(q_camera_per_frame).all(axis=1) & np.isfinite(t_camera_per_frame).all(axis=1))
+    q_camera_to_log = q_camera_per_frame[camera_finite_idx].astype(np.float32)
+    t_camera_to_log = t_camera_per_frame[camera_finite_idx].astype(np.float32)
+    # Rerun holds the latest transform, so a row is only needed where the logged value changes
+    # (e.g. runs of identity or clamped poses collapse to their first frame)
+    camera_changed = np.ones(len(camera_finite_idx), dtype=bool)
+    camera_changed[1:] = (np.diff(q_camera_to_log, axis=0) != 0).any(axis=1) | (np.diff(t_camera_to_log, axis=0) != 0).any(axis=1)
+    camera_log_idx = camera_finite_idx[camera_changed]
+    rr.send_columns(
+        base_camera_path,
+        indexes=[
+            rr.TimeColumn("timestamp", timestamp=primary_timestamps[camera_log_idx]),
+            rr.TimeColumn(frame_timeline, sequence=camera_log_idx),
+        ],
+        columns=rr.Transform3D.columns(
+            translation=t_camera_to_log[camera_changed],
+            quaternion=q_camera_to_log[camera_changed],
+        ),
+    )
+
+    # Log the closest IMU event's scalars for every frame as whole columns, before the frame loop
+    if imu_idx_per_frame is not None:
+        log_imu_scalar_columns(
+            imu_data_path,
+            [
+                rr.TimeColumn("timestamp", timestamp=primary_timestamps),
+                rr.TimeColumn(frame_timeline, sequence=np.arange(num_frames_to_log)),
+            ],
+            session_imu_events["attitude"][imu_idx_per_frame],
+            session_imu_events["rotationRate"][imu_idx_per_frame],
+            session_imu_events["userAcceleration"][imu_idx_per_frame]
+        )
+
+    # --- Video: decoded BGR frames are collected into fixed-size chunks and sent as image columns ---
+    if source_type == "video" and video_frame_generator:
+        rgb_path = f"{base_camera_path}/rgb"
+        rgb_chunk = None # (VIDEO_LOG_CHUNK_FRAMES, H*W*3) uint8, allocated on the first decoded frame
+        rgb_chunk_frame_idx = np.empty(VIDEO_LOG_CHUNK_FRAMES, dtype=np.int64)
+        rgb_chunk_len = 0
+
+        # Skipped frames are only grabbed by the decoder, never converted or copied
+        for i in range(0, num_frames_to_log, rgb_frame_skip_interval):
             video_frame = next(video_frame_generator, None)
-            if video_frame is not None:
-                rr.log(f"{base_camera_path}/rgb", rr.Image(video_frame))
-                # If depth overlay debug is needed, video_frame is available here
-            elif i < num_frames_to_log : # Check if we expected a frame
-                 print(f"Warning: Video frame generator did not yield a frame for index {i} (time {current_time_sec:.3f}s) in {session_id}")
-        
-        # Log Depth Frame (with framerate control)
-        if scanned_depth_info_list and (i % depth_frame_skip_interval == 0):
-            closest_depth_info = find_closest_event_by_timestamp(current_time_sec, scanned_depth_info_list, "timestamp")
-            if closest_depth_info:
-                depth_h_meta = session_metadata.get('depthHeight')
-                depth_w_meta = session_metadata.get('depthWidth')
-                current_depth_frame = load_single_depth_frame(closest_depth_info['path'], depth_h_meta, depth_w_meta)
-                
-                if current_depth_frame is not None:
-                    # --- Orientation check and fix (simplified) ---
-                    # This needs the video frame dimensions (width, height) established earlier for the Pinhole
-                    # The original script's logic for depth_needs_rot90 etc. would go here.
-                    # For now, assume depth is correctly oriented or use a simple check.
-                    if not depth_orientation_checked:
-                        # rgb_shape_ref = (height, width) # Target shape from Pinhole
-                        # depth_shape_current = current_depth_frame.shape
-                        # if rgb_shape_ref == depth_shape_current[::-1]: # Example: if transposed
-                        #     depth_needs_rot90 = True
-                        # depth_orientation_checked = True # Check only once
-                        pass # Placeholder for full orientation logic
-
-                    # if depth_needs_rot90: current_depth_frame = np.rot90(current_depth_frame)
-                    
-                    # --- FOV alignment: Upsample/Downsample depth to match target Pinhole resolution (width, height) ---
-                    target_depth_shape_hw = (height, width) # (height, width) from Pinhole
-                    if current_depth_frame.shape != target_depth_shape_hw:
-                        current_depth_frame_resized = cv2.resize(
-                            current_depth_frame,
-                            (target_depth_shape_hw[1], target_depth_shape_hw[0]), # cv2.resize expects (w,h)
-                            interpolation=cv2.INTER_NEAREST # Use INTER_NEAREST for depth, or INTER_LINEAR if smoother results preferred
-                        )
-                    else:
-                        current_depth_frame_resized = current_depth_frame
-                    
-                    # Log depth (original had debug overlay too, can be added back if video_frame is available)
-                    rr.log(f"{base_camera_path}/depth", rr.DepthImage(current_depth_frame_resized, meter=1.0))
-
-        if i % 100 == 0 and i > 0: # Print progress
-            print(f"  Logged frame {i+1}/{num_frames_to_log} for {session_id} at time {current_time_sec:.2f}s")
-
-    if source_type == "video" and video_frame_generator and hasattr(video_frame_generator, 'close'):
-        video_frame_generator.close() # Ensure generator resources are freed if applicable
+            if video_frame is None:
+                print(f"Warning: Video frame generator did not yield a frame for index {i} (time {primary_timestamps[i]:.3f}s) in {session_id}")
+                continue
+            if rgb_chunk is None:
+                frame_h, frame_w = video_frame.shape[:2]
+                # OpenCV decodes to BGR; logging that color model lets the viewer swap channels instead of cvtColor per frame
+                rr.log(rgb_path, rr.Image.from_fields(format=rr.components.ImageFormat(
+                    width=frame_w, height=frame_h, color_model="BGR", channel_datatype="U8")), static=True)
+                rgb_chunk = np.empty((VIDEO_LOG_CHUNK_FRAMES, video_frame.size), dtype=np.uint8)
+            rgb_chunk[rgb_chunk_len] = video_frame.reshape(-1)
+            rgb_chunk_frame_idx[rgb_chunk_len] = i
+            rgb_chunk_len += 1
+            if rgb_chunk_len == VIDEO_LOG_CHUNK_FRAMES:
+                # rr.TimeColumn keeps int64 sequences without copying, so the reused index buffer must not be sent as-is
+                send_image_frame_columns(rgb_path, frame_timeline, primary_timestamps[rgb_chunk_frame_idx], rgb_chunk_frame_idx.copy(), rgb_chunk)
+                rgb_chunk_len = 0
+            # If depth overlay debug is needed, video_frame is available here
+
+        if rgb_chunk_len:
+            chunk_frame_idx = rgb_chunk_frame_idx[:rgb_chunk_len].copy()
+            send_image_frame_columns(rgb_path, frame_timeline, primary_timestamps[chunk_frame_idx], chunk_frame_idx, rgb_chunk[:rgb_chunk_len])
+        video_frame_generator.close() # Ensure generator resources are freed
+
+    # --- Depth runs on its own schedule (with framerate control), decoupled from the video loop ---
+    if depth_idx_per_frame is not None:
+        depth_path = f"{base_camera_path}/depth"
+        # Every depth_frame_skip_interval-th frame gets its closest depth map, read ahead on a thread pool
+        depth_schedule = np.arange(0, num_frames_to_log, depth_frame_skip_interval)
+        depth_frames = prefetch_depth_frames(
+            (scanned_depth_info_list[depth_idx] for depth_idx in depth_idx_per_frame[depth_schedule]),
+            session_metadata.get('depthHeight'), session_metadata.get('depthWidth'))
+        # Depth is logged as half floats: ~0.05% relative precision (2-3 mm at 5 m) is ample for visualization
+        # and halves the bytes copied into Rerun
+        depth_chunk = None # (DEPTH_LOG_CHUNK_FRAMES, H*W) float16, allocated on the first loaded frame
+        depth_chunk_frame_idx = np.empty(DEPTH_LOG_CHUNK_FRAMES, dtype=np.int64)
+        depth_chunk_len = 0
+        target_depth_shape_hw = (height, width) # (height, width) from Pinhole
+        # Every loaded frame has the meta.json depth shape, so the resize decision is made once per session
+        depth_needs_resize = (session_metadata.get('depthHeight'), session_metadata.get('depthWidth')) != target_depth_shape_hw
+        target_depth_size_wh = (width, height) # cv2.resize expects (w,h)
+        # Resized frames are copied straight into the float16 chunk, so one float32 scratch frame is reused for every resize
+        depth_resize_buffer = np.empty(target_depth_shape_hw, dtype=np.float32) if depth_needs_resize else None
+
+        for i, current_depth_frame in zip(depth_schedule, depth_frames):
+            if current_depth_frame is None:
+                continue
+            # --- Orientation check and fix (simplified) ---
+            # This needs the video frame dimensions (width, height) established earlier for the Pinhole
+            # The original script's logic for depth_needs_rot90 etc. would go here.
+            # For now, assume depth is correctly oriented or use a simple check.
+            if not depth_orientation_checked:
+                # rgb_shape_ref = (height, width) # Target shape from Pinhole
+                # depth_shape_current = current_depth_frame.shape
+                # if rgb_shape_ref == depth_shape_current[::-1]: # Example: if transposed
+                #     depth_needs_rot90 = True
+                # depth_orientation_checked = True # Check only once
+                pass # Placeholder for full orientation logic
+
+            # if depth_needs_rot90: current_depth_frame = np.rot90(current_depth_frame)
+
+            # --- FOV alignment: Upsample/Downsample depth to match target Pinhole resolution (width, height) ---
+            if depth_needs_resize:
+                current_depth_frame_resized = cv2.resize(
+                    current_depth_frame,
+                    target_depth_size_wh,
+                    dst=depth_resize_buffer,
+                    interpolation=cv2.INTER_NEAREST # Use INTER_NEAREST for depth, or INTER_LINEAR if smoother results preferred
+                )
+            else:
+                current_depth_frame_resized = current_depth_frame
+
+            # Log depth in chunks (original had debug overlay too, can be added back if video frames are kept)
+            if depth_chunk is None:
+                rr.log(depth_path, rr.DepthImage.from_fields(
+                    format=rr.components.ImageFormat(width=target_depth_shape_hw[1], height=target_depth_shape_hw[0], channel_datatype="F16"),
+                    meter=1.0), static=True)
+                depth_chunk = np.empty((DEPTH_LOG_CHUNK_FRAMES, current_depth_frame_resized.size), dtype=np.float16)
+            depth_chunk[depth_chunk_len] = current_depth_frame_resized.reshape(-1)
+            depth_chunk_frame_idx[depth_chunk_len] = i
+            depth_chunk_len += 1
+            if depth_chunk_len == DEPTH_LOG_CHUNK_FRAMES:
+                # Copy the reused index buffer: rr.TimeColumn keeps int64 sequences without copying
+                send_image_frame_columns(depth_path, frame_timeline, primary_timestamps[depth_chunk_frame_idx], depth_chunk_frame_idx.copy(), depth_chunk, archetype=rr.DepthImage)
+                depth_chunk_len = 0
+
+        if depth_chunk_len:
+            chunk_frame_idx = depth_chunk_frame_idx[:depth_chunk_len].copy()
+            send_image_frame_columns(depth_path, frame_timeline, primary_timestamps[chunk_frame_idx], chunk_frame_idx, depth_chunk[:depth_chunk_len], archetype=rr.DepthImage)
+        depth_frames.close() # Shuts down the depth reader threads
 
     print(f"Finished logging {num_frames_to_log} synchronized frames to Rerun for session {session_id}")
     # rr.spawn() # If not spawned earlier, could be spawned here after all data for the session is logged.
@@ -732,6 +1019,16 @@ def main():
         type=str, 
         help="The ID of the scan session to visualize (e.g., Scan-20250521-0200). If not provided, the latest session will be used."
     )
+    parser.add_argument(
+        "--pack_depth",
+        action="store_true",
+        help=f"Pack the session's .d32 depth files into {DEPTH_PACK_FILENAME} + {DEPTH_INDEX_FILENAME} so later replays read one memory-mapped file."
+    )
+    parser.add_argument(
+        "--max_video_fps",
+        type=float,
+        help="Log at most this many RGB frames per second; skipped video frames are not decoded. If not provided, every frame is logged."
+    )
     args = parser.parse_args()
 
     session_to_visualize = args.session_id
@@ -762,12 +1059,12 @@ def main():
     print(f"Processing session: {session_to_visualize}")
 
     # Load IMU data for the specified session
-    imu_events = []
+    imu_events = {}
     imu_file = locate_imu_file(session_folder)
     if imu_file:
         print(f"Parsing IMU data from {imu_file}")
         imu_events = parse_imu_bin(imu_file)
-        print(f"Extracted {len(imu_events)} IMU events")
+        print(f"Extracted {len(imu_events['timestamp']) if imu_events else 0} IMU events")
     else:
         print(f"No IMU file found in {session_folder}")
 
@@ -804,29 +1101,36 @@ def main():
         print(f"No video_timestamps.json or video.mov found in {session_folder}. Video timestamps will be empty.")
         
     # Scan depth files (get paths and timestamps without loading data)
-    scanned_depth_info_list = []
+    scanned_depth_info_list = load_packed_depth_index(session_folder)
     depth_dir = session_folder / "depth"
-    if depth_dir.exists():
+    if scanned_depth_info_list:
+        print(f"Using {len(scanned_depth_info_list)} packed depth frames from {session_folder / DEPTH_PACK_FILENAME}")
+    elif depth_dir.exists():
         print(f"Scanning depth frames from {depth_dir}")
         scanned_depth_info_list = scan_depth_files(depth_dir)
         if scanned_depth_info_list:
             print(f"Found {len(scanned_depth_info_list)} depth files with timestamps for {session_to_visualize}")
+            if args.pack_depth:
+                if session_metadata.get('depthHeight') and session_metadata.get('depthWidth'):
+                    scanned_depth_info_list = pack_depth_files(session_folder, scanned_depth_info_list, session_metadata['depthHeight'], session_metadata['depthWidth'])
+                else:
+                    print("Cannot pack depth frames: depthWidth/depthHeight missing from meta.json.")
         else:
             print(f"No depth files with parsable timestamps found in {depth_dir}.")
     else:
         print(f"No depth/ directory found in {session_folder}.")
 
     # Load camera poses
-    camera_poses_list = parse_camera_poses(session_folder)
-    if not camera_poses_list and imu_events: # If no camera_poses.json, create a placeholder from IMU
+    camera_poses = parse_camera_poses(session_folder)
+    if camera_poses is None and imu_events: # If no camera poses file, create a placeholder from IMU
         # This function saves to file, parse_camera_poses would then load it if called again,
         # or we can use the returned poses directly if modified.
-        # For now, let's assume parse_camera_poses is the sole source for camera_poses_list.
+        # For now, let's assume parse_camera_poses is the sole source for camera_poses.
         # If it's critical to generate and use immediately without re-parsing:
-        # cam_poses_path = session_folder / "camera_poses.json"
+        # cam_poses_path = session_folder / CAMERA_POSES_NPZ_FILENAME
         # if not cam_poses_path.exists():
         # save_camera_poses_from_imu(session_folder, imu_events) # This saves to file
-        # camera_poses_list = parse_camera_poses(session_folder) # Reload
+        # camera_poses = parse_camera_poses(session_folder) # Reload
         pass # Current logic: parse_camera_poses handles loading or returns None. Placeholder logic is separate.
 
 
@@ -845,7 +1149,8 @@ def main():
         session_metadata=session_metadata,
         video_timestamps_list=video_timestamps_list,
         scanned_depth_info_list=scanned_depth_info_list,
-        camera_poses_list=camera_poses_list if camera_poses_list else [] # Ensure it's a list
+        camera_poses=camera_poses,
+        max_video_fps=args.max_video_fps
     )
     
     rr.spawn() # Spawn the Rerun viewer after all logging is done.